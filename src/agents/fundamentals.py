@@ -4,6 +4,27 @@ from langchain_core.messages import HumanMessage
 from agents.state import AgentState, show_agent_reasoning
 
 import json
+import operator
+from collections import Counter
+
+# Aspects scored by the fundamentals agent, in signal order
+FUNDAMENTAL_ASPECTS = ("Profitability", "Growth", "Financial_Health", "Price_Ratios")
+
+# (aspect, metric, comparison, threshold) for each single-metric check.
+# fundamentals_agent unpacks the metric values in this order.
+SCORING_RULES = (
+    ("Profitability", "return_on_equity", operator.gt, 0.15),  # Strong ROE above 15%
+    ("Profitability", "net_margin", operator.gt, 0.20),  # Healthy profit margins
+    ("Profitability", "operating_margin", operator.gt, 0.15),  # Strong operating efficiency
+    ("Growth", "revenue_growth", operator.gt, 0.10),  # 10% revenue growth
+    ("Growth", "earnings_growth", operator.gt, 0.10),  # 10% earnings growth
+    ("Growth", "book_value_growth", operator.gt, 0.10),  # 10% book value growth
+    ("Financial_Health", "current_ratio", operator.gt, 1.5),  # Strong liquidity
+    ("Financial_Health", "debt_to_equity", operator.lt, 0.5),  # Conservative debt levels
+    ("Price_Ratios", "price_to_earnings_ratio", operator.lt, 25),  # Reasonable P/E ratio
+    ("Price_Ratios", "price_to_book_ratio", operator.lt, 3),  # Reasonable P/B ratio
+    ("Price_Ratios", "price_to_sales_ratio", operator.lt, 5),  # Reasonable P/S ratio
+)
 
 ##### Fundamental Agent #####
 def fundamentals_agent(state: AgentState):
@@ -14,69 +35,48 @@ def fundamentals_agent(state: AgentState):
     financial_line_item = data["financial_line_items"][0]
     market_cap = data["market_cap"]
 
+    # Read each scored metric once, the details strings below reuse the same values
+    values = [metrics[metric] for _, metric, _, _ in SCORING_RULES]
+    (
+        return_on_equity, net_margin, operating_margin,
+        revenue_growth, earnings_growth, _,
+        current_ratio, debt_to_equity,
+        pe_ratio, pb_ratio, ps_ratio,
+    ) = values
+
+    # Score each fundamental aspect against its thresholds
+    scores = dict.fromkeys(FUNDAMENTAL_ASPECTS, 0)
+    for (aspect, _, compare, threshold), value in zip(SCORING_RULES, values):
+        scores[aspect] += compare(value, threshold)
+    # FCF conversion compares two metrics, so it is scored outside the rules table
+    scores["Financial_Health"] += metrics["free_cash_flow_per_share"] > metrics["earnings_per_share"] * 0.8
+
     # Initialize signals list for different fundamental aspects
-    signals = []
+    signals = [
+        'bullish' if scores[aspect] >= 2 else 'bearish' if scores[aspect] == 0 else 'neutral'
+        for aspect in FUNDAMENTAL_ASPECTS
+    ]
     reasoning = {}
-    
+
     # 1. Profitability Analysis
-    profitability_score = 0
-    if metrics["return_on_equity"] > 0.15:  # Strong ROE above 15%
-        profitability_score += 1
-    if metrics["net_margin"] > 0.20:  # Healthy profit margins
-        profitability_score += 1
-    if metrics["operating_margin"] > 0.15:  # Strong operating efficiency
-        profitability_score += 1
-        
-    signals.append('bullish' if profitability_score >= 2 else 'bearish' if profitability_score == 0 else 'neutral')
     reasoning["Profitability"] = {
         "signal": signals[0],
-        "details": f"ROE: {metrics['return_on_equity']:.2%}, Net Margin: {metrics['net_margin']:.2%}, Op Margin: {metrics['operating_margin']:.2%}"
+        "details": f"ROE: {return_on_equity:.2%}, Net Margin: {net_margin:.2%}, Op Margin: {operating_margin:.2%}"
     }
     
     # 2. Growth Analysis
-    growth_score = 0
-    if metrics["revenue_growth"] > 0.10:  # 10% revenue growth
-        growth_score += 1
-    if metrics["earnings_growth"] > 0.10:  # 10% earnings growth
-        growth_score += 1
-    if metrics["book_value_growth"] > 0.10:  # 10% book value growth
-        growth_score += 1
-        
-    signals.append('bullish' if growth_score >= 2 else 'bearish' if growth_score == 0 else 'neutral')
     reasoning["Growth"] = {
         "signal": signals[1],
-        "details": f"Revenue Growth: {metrics['revenue_growth']:.2%}, Earnings Growth: {metrics['earnings_growth']:.2%}"
+        "details": f"Revenue Growth: {revenue_growth:.2%}, Earnings Growth: {earnings_growth:.2%}"
     }
     
     # 3. Financial Health
-    health_score = 0
-    if metrics["current_ratio"] > 1.5:  # Strong liquidity
-        health_score += 1
-    if metrics["debt_to_equity"] < 0.5:  # Conservative debt levels
-        health_score += 1
-    if metrics["free_cash_flow_per_share"] > metrics["earnings_per_share"] * 0.8:  # Strong FCF conversion
-        health_score += 1
-        
-    signals.append('bullish' if health_score >= 2 else 'bearish' if health_score == 0 else 'neutral')
     reasoning["Financial_Health"] = {
         "signal": signals[2],
-        "details": f"Current Ratio: {metrics['current_ratio']:.2f}, D/E: {metrics['debt_to_equity']:.2f}"
+        "details": f"Current Ratio: {current_ratio:.2f}, D/E: {debt_to_equity:.2f}"
     }
     
     # 4. Price to X ratios
-    pe_ratio = metrics["price_to_earnings_ratio"]
-    pb_ratio = metrics["price_to_book_ratio"]
-    ps_ratio = metrics["price_to_sales_ratio"]
-    
-    price_ratio_score = 0
-    if pe_ratio < 25:  # Reasonable P/E ratio
-        price_ratio_score += 1
-    if pb_ratio < 3:  # Reasonable P/B ratio
-        price_ratio_score += 1
-    if ps_ratio < 5:  # Reasonable P/S ratio
-        price_ratio_score += 1
-        
-    signals.append('bullish' if price_ratio_score >= 2 else 'bearish' if price_ratio_score == 0 else 'neutral')
     reasoning["Price_Ratios"] = {
         "signal": signals[3],
         "details": f"P/E: {pe_ratio:.2f}, P/B: {pb_ratio:.2f}, P/S: {ps_ratio:.2f}"
@@ -86,7 +86,7 @@ def fundamentals_agent(state: AgentState):
     free_cash_flow = financial_line_item.get('free_cash_flow')
     intrinsic_value = calculate_intrinsic_value(
         free_cash_flow=free_cash_flow,
-        growth_rate=metrics["earnings_growth"],
+        growth_rate=earnings_growth,
         discount_rate=0.10,
         terminal_growth_rate=0.03,
         num_years=5,
@@ -102,8 +102,9 @@ def fundamentals_agent(state: AgentState):
     }
     
     # Determine overall signal
-    bullish_signals = signals.count('bullish')
-    bearish_signals = signals.count('bearish')
+    signal_counts = Counter(signals)
+    bullish_signals = signal_counts['bullish']
+    bearish_signals = signal_counts['bearish']
     
     if bullish_signals > bearish_signals:
         overall_signal = 'bullish'
@@ -122,8 +123,8 @@ def fundamentals_agent(state: AgentState):
         "reasoning": reasoning
     }
     
-    # Create the fundamental analysis message
-    message = HumanMessage(
+    # Create the fundamental analysis message, the content is our own JSON so validation is skipped
+    message = HumanMessage.model_construct(
         content=json.dumps(message_content),
         name="fundamentals_agent",
     )
@@ -148,20 +149,21 @@ def calculate_intrinsic_value(
     Computes the discounted cash flow (DCF) for a given company based on the current free cash flow.
     Use this function to calculate the intrinsic value of a stock.
     """
-    # Estimate the future cash flows based on the growth rate
-    cash_flows = [free_cash_flow * (1 + growth_rate) ** i for i in range(num_years)]
-
-    # Calculate the present value of projected cash flows
-    present_values = []
-    for i in range(num_years):
-        present_value = cash_flows[i] / (1 + discount_rate) ** (i + 1)
-        present_values.append(present_value)
+    # Present value of the projected cash flows. Cash flow i is
+    # free_cash_flow * (1 + growth_rate) ** i discounted by (1 + discount_rate) ** (i + 1),
+    # so the sum is a geometric series with ratio (1 + growth_rate) / (1 + discount_rate).
+    ratio = (1 + growth_rate) / (1 + discount_rate)
+    if ratio == 1:
+        present_value = free_cash_flow * num_years / (1 + discount_rate)
+    else:
+        present_value = free_cash_flow / (1 + discount_rate) * (1 - ratio ** num_years) / (1 - ratio)
 
-    # Calculate the terminal value
-    terminal_value = cash_flows[-1] * (1 + terminal_growth_rate) / (discount_rate - terminal_growth_rate)
+    # Calculate the terminal value from the last projected cash flow
+    last_cash_flow = free_cash_flow * (1 + growth_rate) ** (num_years - 1)
+    terminal_value = last_cash_flow * (1 + terminal_growth_rate) / (discount_rate - terminal_growth_rate)
     terminal_present_value = terminal_value / (1 + discount_rate) ** num_years
 
     # Sum up the present values and terminal value
-    dcf_value = sum(present_values) + terminal_present_value
+    dcf_value = present_value + terminal_present_value
 
-    return dcf_value
\ No newline at end of file
+    return dcf_value
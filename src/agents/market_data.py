@@ -1,12 +1,10 @@
-
-from langchain_openai.chat_models import ChatOpenAI
-
 from agents.state import AgentState
 from tools.api import search_line_items, get_financial_metrics, get_insider_trades, get_market_cap, get_prices
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-llm = ChatOpenAI(model="gpt-4o")
+from dateutil.relativedelta import relativedelta
 
 def market_data_agent(state: AgentState):
     """Responsible for gathering and preprocessing market data"""
@@ -18,51 +16,62 @@ def market_data_agent(state: AgentState):
     if not data["start_date"]:
         # Calculate 3 months before end_date
         end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-        start_date = end_date_obj.replace(month=end_date_obj.month - 3) if end_date_obj.month > 3 else \
-            end_date_obj.replace(year=end_date_obj.year - 1, month=end_date_obj.month + 9)
-        start_date = start_date.strftime('%Y-%m-%d')
+        start_date = (end_date_obj - relativedelta(months=3)).strftime('%Y-%m-%d')
     else:
         start_date = data["start_date"]
 
-    # Get the historical price data
-    prices = get_prices(
-        ticker=data["ticker"], 
-        start_date=start_date, 
-        end_date=end_date,
-    )
+    # The five requests are independent, so issue them concurrently
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        # Get the historical price data
+        prices_future = executor.submit(
+            get_prices,
+            ticker=data["ticker"], 
+            start_date=start_date, 
+            end_date=end_date,
+        )
+
+        # Get the financial metrics
+        financial_metrics_future = executor.submit(
+            get_financial_metrics,
+            ticker=data["ticker"], 
+            report_period=end_date, 
+            period='ttm', 
+            limit=1,
+        )
 
-    # Get the financial metrics
-    financial_metrics = get_financial_metrics(
-        ticker=data["ticker"], 
-        report_period=end_date, 
-        period='ttm', 
-        limit=1,
-    )
+        # Get the insider trades
+        insider_trades_future = executor.submit(
+            get_insider_trades,
+            ticker=data["ticker"], 
+            end_date=end_date,
+            limit=5,
+        )
 
-    # Get the insider trades
-    insider_trades = get_insider_trades(
-        ticker=data["ticker"], 
-        end_date=end_date,
-        limit=5,
-    )
+        # Get the market cap
+        market_cap_future = executor.submit(
+            get_market_cap,
+            ticker=data["ticker"],
+        )
 
-    # Get the market cap
-    market_cap = get_market_cap(
-        ticker=data["ticker"],
-    )
+        # Get the line_items
+        financial_line_items_future = executor.submit(
+            search_line_items,
+            ticker=data["ticker"], 
+            line_items=["free_cash_flow"],
+            period='ttm',
+            limit=1,
+        )
 
-    # Get the line_items
-    financial_line_items = search_line_items(
-        ticker=data["ticker"], 
-        line_items=["free_cash_flow"],
-        period='ttm',
-        limit=1,
-    )
+        prices = prices_future.result()
+        financial_metrics = financial_metrics_future.result()
+        insider_trades = insider_trades_future.result()
+        market_cap = market_cap_future.result()
+        financial_line_items = financial_line_items_future.result()
 
     return {
         "messages": messages,
+        # Only the new keys, the merge_dicts reducer folds them into the state
         "data": {
-            **data, 
             "prices": prices, 
             "start_date": start_date, 
             "end_date": end_date,
@@ -38,11 +38,12 @@ def risk_management_agent(state: AgentState):
     }
 
     # 1. Calculate Risk Metrics
-    returns = prices_df['close'].pct_change().dropna()
+    close_prices = prices_df['close']
+    returns = close_prices.pct_change().dropna()
     daily_vol = returns.std()
     volatility = daily_vol * (252 ** 0.5)  # Annualized volatility approximation
     var_95 = returns.quantile(0.05)         # Simple historical VaR at 95% confidence
-    max_drawdown = (prices_df['close'] / prices_df['close'].cummax() - 1).min()
+    max_drawdown = (close_prices / close_prices.cummax() - 1).min()
 
     # 2. Market Risk Assessment
     market_risk_score = 0
@@ -68,7 +69,7 @@ def risk_management_agent(state: AgentState):
 
     # 3. Position Size Limits
     # Consider total portfolio value, not just cash
-    current_stock_value = portfolio['stock'] * prices_df['close'].iloc[-1]
+    current_stock_value = portfolio['stock'] * close_prices.iloc[-1]
     total_portfolio_value = portfolio['cash'] + current_stock_value
 
     base_position_size = total_portfolio_value * 0.25  # Start with 25% max position of total portfolio
@@ -95,7 +96,7 @@ def risk_management_agent(state: AgentState):
 
     for scenario, decline in stress_test_scenarios.items():
         potential_loss = current_position_value * decline
-        portfolio_impact = potential_loss / (portfolio['cash'] + current_position_value) if (portfolio['cash'] + current_position_value) != 0 else math.nan
+        portfolio_impact = potential_loss / total_portfolio_value if total_portfolio_value != 0 else math.nan
         stress_test_results[scenario] = {
             "potential_loss": potential_loss,
             "portfolio_impact": portfolio_impact
@@ -147,7 +148,7 @@ def risk_management_agent(state: AgentState):
     }
 
     # Create the risk management message
-    message = HumanMessage(
+    message = HumanMessage.model_construct(
         content=json.dumps(message_content),
         name="risk_management_agent",
     )
@@ -13,19 +13,18 @@ def sentiment_agent(state: AgentState):
     show_reasoning = state["metadata"]["show_reasoning"]
 
     # Loop through the insider trades, if transaction_shares is negative, then it is a sell, which is bearish, if positive, then it is a buy, which is bullish
-    signals = []
+    bullish_signals = 0
+    bearish_signals = 0
     for trade in insider_trades:
         transaction_shares = trade["transaction_shares"]
         if not transaction_shares:
             continue
         if transaction_shares < 0:
-            signals.append("bearish")
+            bearish_signals += 1
         else:
-            signals.append("bullish")
+            bullish_signals += 1
 
     # Determine overall signal
-    bullish_signals = signals.count("bullish")
-    bearish_signals = signals.count("bearish")
     if bullish_signals > bearish_signals:
         overall_signal = "bullish"
     elif bearish_signals > bullish_signals:
@@ -34,7 +33,7 @@ def sentiment_agent(state: AgentState):
         overall_signal = "neutral"
 
     # Calculate confidence level based on the proportion of indicators agreeing
-    total_signals = len(signals)
+    total_signals = bullish_signals + bearish_signals
     confidence = max(bullish_signals, bearish_signals) / total_signals
 
     message_content = {
@@ -48,7 +47,7 @@ def sentiment_agent(state: AgentState):
         show_agent_reasoning(message_content, "Sentiment Analysis Agent")
 
     # Create the sentiment message
-    message = HumanMessage(
+    message = HumanMessage.model_construct(
         content=json.dumps(message_content),
         name="sentiment_agent",
     )
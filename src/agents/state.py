@@ -8,6 +8,11 @@ import json
 
 
 def merge_dicts(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    # Skip the copy when one side adds nothing, e.g. agents handing back the data they were given
+    if not b or a is b:
+        return a
+    if not a:
+        return b
     return {**a, **b}
 
 # Define agent state
@@ -18,27 +23,22 @@ class AgentState(TypedDict):
 
 
 
+def _to_serializable(obj):
+    """Fallback for json.dumps on objects it cannot encode natively"""
+    if hasattr(obj, 'to_dict'):  # Handle Pandas Series/DataFrame
+        return obj.to_dict()
+    elif hasattr(obj, '__dict__'):  # Handle custom objects
+        return obj.__dict__
+    else:
+        return str(obj)  # Fallback to string representation
+
+
 def show_agent_reasoning(output, agent_name):
     print(f"\n{'=' * 10} {agent_name.center(28)} {'=' * 10}")
     
-    def convert_to_serializable(obj):
-        if hasattr(obj, 'to_dict'):  # Handle Pandas Series/DataFrame
-            return obj.to_dict()
-        elif hasattr(obj, '__dict__'):  # Handle custom objects
-            return obj.__dict__
-        elif isinstance(obj, (int, float, bool, str)):
-            return obj
-        elif isinstance(obj, (list, tuple)):
-            return [convert_to_serializable(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {key: convert_to_serializable(value) for key, value in obj.items()}
-        else:
-            return str(obj)  # Fallback to string representation
-    
     if isinstance(output, (dict, list)):
-        # Convert the output to JSON-serializable format
-        serializable_output = convert_to_serializable(output)
-        print(json.dumps(serializable_output, indent=2))
+        # Only objects json can't encode natively go through the fallback
+        print(json.dumps(output, indent=2, default=_to_serializable))
     else:
         try:
             # Parse the string as JSON and pretty print it
@@ -48,4 +48,4 @@ def show_agent_reasoning(output, agent_name):
             # Fallback to original string if not valid JSON
             print(output)
     
-    print("=" * 48)
\ No newline at end of file
+    print("=" * 48)
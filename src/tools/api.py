@@ -1,10 +1,96 @@
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
-import requests
+from tools.cache import ONE_DAY, ONE_QUARTER, ONE_WEEK, NotModified, cached, revalidation
+
+BASE_URL = "https://api.financialdatasets.ai"
+FINANCIAL_METRICS_URL = f"{BASE_URL}/financial-metrics/"
+LINE_ITEMS_URL = f"{BASE_URL}/financials/search/line-items"
+INSIDER_TRADES_URL = f"{BASE_URL}/insider-trades/"
+COMPANY_FACTS_URL = f"{BASE_URL}/company/facts"
+PRICES_URL = f"{BASE_URL}/prices/"
+
+API_KEY = os.environ.get("FINANCIAL_DATASETS_API_KEY")
+
+# Shared session so requests reuse pooled keep-alive connections
+session = requests.Session()
+session.headers.update({"X-API-KEY": API_KEY})
+session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.3)),
+)
+
+def _require_api_key() -> None:
+    """Fail before making a request that the API would reject without a key."""
+    if API_KEY is None:
+        raise ValueError("FINANCIAL_DATASETS_API_KEY environment variable is not set")
+
+def _parse_response(response: requests.Response) -> Dict[str, Any]:
+    """Return the JSON body of a successful response, raising on any other status."""
+    if response.status_code != 200:
+        raise Exception(
+            f"Error fetching data: {response.status_code} - {response.text}"
+        )
+    return response.json()
+
+def _store_validators(validators: Dict[str, str], response: requests.Response) -> None:
+    """Record the ETag / Last-Modified headers a response carries."""
+    for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+        if response.headers.get(header):
+            validators[name] = response.headers[header]
 
+def _get_json(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    GET a JSON response from the API.
+    When a cached() call is refreshing an expired entry that has an ETag or Last-Modified,
+    the request is made conditional and NotModified is raised if the server answers 304.
+    """
+    validators = revalidation.get()
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = session.get(url, params=params, headers=headers, timeout=30)
+    if response.status_code == 304 and validators:
+        _store_validators(validators, response)
+        raise NotModified()
+    data = _parse_response(response)
+
+    if validators is not None:
+        validators.clear()
+        _store_validators(validators, response)
+    return data
+
+def _fetch_results(
+    url: str,
+    result_key: str,
+    description: str,
+    params: Optional[Dict[str, Any]] = None,
+    body: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Fetch an API endpoint and return the result_key field of the response.
+    Requests with a body are sent as POST, all others as (conditional) GET.
+    Raises ValueError if the field is missing or empty.
+    """
+    _require_api_key()
+    if body is not None:
+        data = _parse_response(session.post(url, json=body, timeout=30))
+    else:
+        data = _get_json(url, params=params)
+    results = data.get(result_key)
+    if not results:
+        raise ValueError(f"No {description} returned")
+    return results
+
+@cached(ttl=ONE_QUARTER, date_arg="report_period")
 def get_financial_metrics(
     ticker: str,
     report_period: str,
@@ -12,25 +98,16 @@ def get_financial_metrics(
     limit: int = 1
 ) -> List[Dict[str, Any]]:
     """Fetch financial metrics from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/financial-metrics/"
-        f"?ticker={ticker}"
-        f"&report_period_lte={report_period}"
-        f"&limit={limit}"
-        f"&period={period}"
-    )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
-    financial_metrics = data.get("financial_metrics")
-    if not financial_metrics:
-        raise ValueError("No financial metrics returned")
-    return financial_metrics
+    params = {
+        "ticker": ticker,
+        "report_period_lte": report_period,
+        "limit": limit,
+        "period": period,
+    }
+    return _fetch_results(FINANCIAL_METRICS_URL, "financial_metrics", "financial metrics", params=params)
 
+# No date in the request, so this is always the latest TTM figure and a new filing changes it
+@cached(ttl=ONE_DAY)
 def search_line_items(
     ticker: str,
     line_items: List[str],
@@ -38,26 +115,15 @@ def search_line_items(
     limit: int = 1
 ) -> List[Dict[str, Any]]:
     """Fetch cash flow statements from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
     body = {
         "tickers": [ticker],
         "line_items": line_items,
         "period": period,
         "limit": limit
     }
-    response = requests.post(url, headers=headers, json=body)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
-    search_results = data.get("search_results")
-    if not search_results:
-        raise ValueError("No search results returned")
-    return search_results
+    return _fetch_results(LINE_ITEMS_URL, "search_results", "search results", body=body)
 
+@cached(ttl=ONE_QUARTER, date_arg="end_date")
 def get_insider_trades(
     ticker: str,
     end_date: str,
@@ -66,79 +132,53 @@ def get_insider_trades(
     """
     Fetch insider trades for a given ticker and date range.
     """
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/insider-trades/"
-        f"?ticker={ticker}"
-        f"&filing_date_lte={end_date}"
-        f"&limit={limit}"
-    )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
-    insider_trades = data.get("insider_trades")
-    if not insider_trades:
-        raise ValueError("No insider trades returned")
-    return insider_trades
+    params = {
+        "ticker": ticker,
+        "filing_date_lte": end_date,
+        "limit": limit,
+    }
+    return _fetch_results(INSIDER_TRADES_URL, "insider_trades", "insider trades", params=params)
 
+@cached(ttl=ONE_DAY)
 def get_market_cap(
     ticker: str,
 ) -> List[Dict[str, Any]]:
     """Fetch market cap from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f'https://api.financialdatasets.ai/company/facts'
-        f'?ticker={ticker}'
-    )
-
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
-    company_facts = data.get('company_facts')
-    if not company_facts:
-        raise ValueError("No company facts returned")
+    company_facts = _fetch_results(COMPANY_FACTS_URL, "company_facts", "company facts", params={"ticker": ticker})
     return company_facts.get('market_cap')
 
+@cached(ttl=ONE_WEEK, date_arg="end_date")
 def get_prices(
     ticker: str,
     start_date: str,
     end_date: str
 ) -> List[Dict[str, Any]]:
     """Fetch price data from the API."""
-    headers = {"X-API-KEY": os.environ.get("FINANCIAL_DATASETS_API_KEY")}
-    url = (
-        f"https://api.financialdatasets.ai/prices/"
-        f"?ticker={ticker}"
-        f"&interval=day"
-        f"&interval_multiplier=1"
-        f"&start_date={start_date}"
-        f"&end_date={end_date}"
-    )
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(
-            f"Error fetching data: {response.status_code} - {response.text}"
-        )
-    data = response.json()
-    prices = data.get("prices")
-    if not prices:
-        raise ValueError("No price data returned")
-    return prices
+    params = {
+        "ticker": ticker,
+        "interval": "day",
+        "interval_multiplier": 1,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    return _fetch_results(PRICES_URL, "prices", "price data", params=params)
 
 def prices_to_df(prices: List[Dict[str, Any]]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
-    df = pd.DataFrame(prices)
-    df["Date"] = pd.to_datetime(df["time"])
-    df.set_index("Date", inplace=True)
     numeric_cols = ["open", "close", "high", "low", "volume"]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Build all numeric columns as one float array, missing values become NaN
+    rows = [[price.get(col) for col in numeric_cols] for price in prices]
+    try:
+        values = np.array(rows, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Some values aren't numbers, coerce those to NaN column by column
+        values = (
+            pd.DataFrame(rows, columns=numeric_cols)
+            .apply(pd.to_numeric, errors="coerce")
+            .to_numpy(dtype=np.float64)
+        )
+    index = pd.DatetimeIndex(pd.to_datetime([price["time"] for price in prices]), name="Date")
+    df = pd.DataFrame(values, index=index, columns=numeric_cols)
     df.sort_index(inplace=True)
     return df
 
@@ -0,0 +1,180 @@
+import copy
+import hashlib
+import inspect
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+# Defaults to .cache/ at the repository root, override with HEDGE_FUND_CACHE_DIR
+CACHE_DIR = os.environ.get(
+    "HEDGE_FUND_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache"),
+)
+
+# Expiry times, aligned with how often each kind of data changes
+ONE_HOUR = 60 * 60
+ONE_DAY = 24 * ONE_HOUR
+ONE_WEEK = 7 * ONE_DAY
+ONE_QUARTER = 90 * ONE_DAY
+
+
+class FileCache:
+    """Stores JSON-serializable values on disk with an expiry time."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for key, expired or not, or None if there is none."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, or None if it is missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None or entry["expires_at"] < time.time():
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: float, **metadata: Any) -> None:
+        """Store value under key for ttl seconds, along with any extra metadata."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {**metadata, "value": value, "expires_at": time.time() + ttl}
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+file_cache = FileCache()
+
+# In-process copy of recently used cache entries, checked before going to disk.
+# Capped so a long backtest doesn't keep every day's prices and metrics alive.
+MEMORY_CACHE_SIZE = 1024
+memory_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+# market_data_agent calls cached functions from several threads at once
+_memory_lock = threading.Lock()
+
+
+# Validators (etag / last_modified) of the entry a cached() call is refreshing.
+# The HTTP layer reads them to make a conditional request and updates them in place.
+revalidation: ContextVar[Optional[Dict[str, str]]] = ContextVar("revalidation", default=None)
+
+
+class NotModified(Exception):
+    """Raised by a cached function when the server reports the cached value is still current."""
+
+
+def clear_session_cache() -> None:
+    """Forget the in-process cache entries, e.g. between runs of a long-lived process."""
+    with _memory_lock:
+        memory_cache.clear()
+
+
+def _memory_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the in-process entry for key, marking it as recently used."""
+    with _memory_lock:
+        entry = memory_cache.get(key)
+        if entry is not None:
+            memory_cache.move_to_end(key)
+        return entry
+
+
+def _memory_set(key: str, entry: Dict[str, Any]) -> None:
+    """Keep entry in process, dropping the least recently used entries over the cap."""
+    with _memory_lock:
+        memory_cache[key] = entry
+        memory_cache.move_to_end(key)
+        while len(memory_cache) > MEMORY_CACHE_SIZE:
+            memory_cache.popitem(last=False)
+
+
+def cached(ttl: float = ONE_DAY, date_arg: Optional[str] = None) -> Callable:
+    """
+    Cache a function's result for ttl seconds, keyed on its arguments.
+    If date_arg names a YYYY-MM-DD argument that is today or later, the data may still
+    change during the day, so the entry is kept for at most an hour.
+    Lookups go to memory first, then disk, then the function itself.
+    Disk entries are grouped as {ticker}/{function name}/{hash of the arguments}.json.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Bind to the signature so positional and keyword calls share a key
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            digest = hashlib.md5(
+                json.dumps([func.__name__, bound.arguments], sort_keys=True).encode()
+            ).hexdigest()
+            # The ticker comes from the command line, keep it to a single safe path component
+            ticker = re.sub(r"[^A-Za-z0-9._-]", "_", str(bound.arguments.get("ticker", "_")))
+            key = os.path.join(ticker.lstrip(".") or "_", func.__name__, digest)
+
+            entry_ttl = ttl
+            if date_arg is not None and bound.arguments[date_arg] >= date.today().isoformat():
+                entry_ttl = min(ttl, ONE_HOUR)
+
+            entry = _memory_get(key)
+            if entry is None or entry["expires_at"] < time.time():
+                entry = file_cache.get_entry(key)
+                if entry is None or entry["value"] is None or entry["expires_at"] < time.time():
+                    entry = _refresh(func, args, kwargs, key, entry_ttl, stale=entry)
+                # None means the API had no value for the field (e.g. a company without a
+                # reported market cap) that may be filled in later, so neither layer keeps it
+                if entry["value"] is not None:
+                    _memory_set(key, entry)
+            # Hand out a copy so callers can't modify the cached value
+            return copy.deepcopy(entry["value"])
+
+        return wrapper
+    return decorator
+
+
+def _refresh(
+    func: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    key: str,
+    ttl: float,
+    stale: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Call func for a missing or expired entry and store the result."""
+    # Expose the stale entry's validators so the request can be conditional
+    validators = dict(stale.get("validators") or {}) if stale is not None else {}
+    token = revalidation.set(validators)
+    try:
+        value = func(*args, **kwargs)
+    except NotModified:
+        value = stale["value"]
+    finally:
+        revalidation.reset(token)
+
+    if value is not None:
+        try:
+            file_cache.set(key, value, ttl, validators=validators)
+        except (OSError, TypeError, ValueError):
+            # Caching is best-effort, the fetched value is still returned
+            pass
+    return {"value": value, "expires_at": time.time() + ttl, "validators": validators}
@@ -0,0 +1,121 @@
+import glob
+import json
+import math
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from tools import api, cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache.file_cache, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(api, "API_KEY", "test-key")
+    cache.clear_session_cache()
+    yield tmp_path
+    cache.clear_session_cache()
+
+
+def expire_disk_entries(cache_dir):
+    for path in glob.glob(os.path.join(cache_dir, "**", "*.json"), recursive=True):
+        with open(path) as f:
+            entry = json.load(f)
+        entry["expires_at"] = 0
+        with open(path, "w") as f:
+            json.dump(entry, f)
+
+
+def read_entry(cache_dir, ticker, func_name):
+    (path,) = glob.glob(os.path.join(cache_dir, ticker, func_name, "*.json"))
+    with open(path) as f:
+        return json.load(f)
+
+
+def company_facts_response(market_cap, headers):
+    return SimpleNamespace(
+        status_code=200,
+        headers=headers,
+        json=lambda: {"company_facts": {"market_cap": market_cap}},
+        text="",
+    )
+
+
+def price(time, **values):
+    row = {"open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 100, "time": time}
+    row.update(values)
+    return row
+
+
+def test_not_modified_response_reuses_cached_value(isolated_cache, monkeypatch):
+    sent_headers = []
+
+    def fake_get(url, params, headers, timeout):
+        sent_headers.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return SimpleNamespace(status_code=304, headers={"ETag": '"v2"'})
+        return company_facts_response(100.0, {"ETag": '"v1"'})
+
+    monkeypatch.setattr(api.session, "get", fake_get)
+
+    assert api.get_market_cap("AAPL") == 100.0
+    cache.clear_session_cache()
+    expire_disk_entries(isolated_cache)
+    assert api.get_market_cap("AAPL") == 100.0
+
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+    entry = read_entry(isolated_cache, "AAPL", "get_market_cap")
+    assert entry["validators"] == {"etag": '"v2"'}
+    assert entry["expires_at"] > time.time()
+
+
+def test_changed_response_replaces_value_and_validators(isolated_cache, monkeypatch):
+    responses = iter([
+        company_facts_response(100.0, {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        company_facts_response(150.0, {"ETag": '"v2"'}),
+    ])
+    sent_headers = []
+
+    def fake_get(url, params, headers, timeout):
+        sent_headers.append(headers)
+        return next(responses)
+
+    monkeypatch.setattr(api.session, "get", fake_get)
+
+    assert api.get_market_cap("AAPL") == 100.0
+    cache.clear_session_cache()
+    expire_disk_entries(isolated_cache)
+    assert api.get_market_cap("AAPL") == 150.0
+
+    assert sent_headers[1] == {"If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert read_entry(isolated_cache, "AAPL", "get_market_cap")["validators"] == {"etag": '"v2"'}
+
+
+def test_prices_to_df_builds_sorted_float_frame():
+    df = api.prices_to_df([price("2024-01-03", close=4.0), price("2024-01-02")])
+
+    assert list(df.columns) == ["open", "close", "high", "low", "volume"]
+    assert df.index.name == "Date"
+    assert [str(day.date()) for day in df.index] == ["2024-01-02", "2024-01-03"]
+    assert df["close"].tolist() == [2.0, 4.0]
+    assert (df.dtypes == "float64").all()
+
+
+def test_prices_to_df_missing_field_becomes_nan():
+    row = price("2024-01-02")
+    del row["volume"]
+
+    df = api.prices_to_df([row])
+
+    assert math.isnan(df["volume"].iloc[0])
+    assert df["close"].iloc[0] == 2.0
+
+
+def test_prices_to_df_non_numeric_value_becomes_nan():
+    df = api.prices_to_df([price("2024-01-02", close="n/a"), price("2024-01-03", close="5.5")])
+
+    assert math.isnan(df["close"].iloc[0])
+    assert df["close"].iloc[1] == 5.5
+    assert df["open"].tolist() == [1.0, 1.0]
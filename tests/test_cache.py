@@ -0,0 +1,125 @@
+import glob
+import json
+import os
+import time
+from datetime import date
+
+import pytest
+
+from tools import cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache.file_cache, "cache_dir", str(tmp_path))
+    cache.clear_session_cache()
+    yield tmp_path
+    cache.clear_session_cache()
+
+
+def test_positional_and_keyword_calls_share_entry():
+    calls = []
+
+    @cache.cached()
+    def get_prices(ticker, start_date, end_date="2024-01-31"):
+        calls.append(ticker)
+        return [{"close": 1.0}]
+
+    get_prices("AAPL", "2024-01-01")
+    get_prices(ticker="AAPL", start_date="2024-01-01", end_date="2024-01-31")
+    cache.clear_session_cache()
+    get_prices("AAPL", start_date="2024-01-01")
+
+    assert calls == ["AAPL"]
+
+
+def test_expired_entry_is_fetched_again(monkeypatch):
+    calls = []
+
+    @cache.cached(ttl=60)
+    def get_market_cap(ticker):
+        calls.append(ticker)
+        return len(calls)
+
+    assert get_market_cap("AAPL") == 1
+    now = time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 120)
+    assert get_market_cap("AAPL") == 2
+
+
+def test_range_ending_today_is_kept_for_at_most_an_hour(isolated_cache):
+    @cache.cached(ttl=cache.ONE_WEEK, date_arg="end_date")
+    def get_prices(ticker, end_date):
+        return [{"close": 1.0}]
+
+    get_prices("AAPL", date.today().isoformat())
+    (path,) = glob.glob(os.path.join(isolated_cache, "AAPL", "get_prices", "*.json"))
+    with open(path) as f:
+        expires_at = json.load(f)["expires_at"]
+
+    assert expires_at <= time.time() + cache.ONE_HOUR
+
+
+def test_callers_get_independent_copies():
+    @cache.cached()
+    def get_insider_trades(ticker):
+        return [{"transaction_shares": 10}]
+
+    first = get_insider_trades("AAPL")
+    first[0]["transaction_shares"] = -10
+
+    assert get_insider_trades("AAPL") == [{"transaction_shares": 10}]
+
+
+def test_none_is_not_cached():
+    calls = []
+
+    @cache.cached()
+    def get_market_cap(ticker):
+        calls.append(ticker)
+        return None
+
+    get_market_cap("AAPL")
+    get_market_cap("AAPL")
+
+    assert len(calls) == 2
+
+
+def test_failed_write_still_returns_value(tmp_path, monkeypatch):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    monkeypatch.setattr(cache.file_cache, "cache_dir", str(blocker))
+
+    @cache.cached()
+    def get_market_cap(ticker):
+        return 100.0
+
+    assert get_market_cap("AAPL") == 100.0
+
+
+def test_ticker_cannot_escape_cache_dir(isolated_cache):
+    @cache.cached()
+    def get_market_cap(ticker):
+        return 100.0
+
+    get_market_cap("../../escape")
+
+    (path,) = glob.glob(os.path.join(isolated_cache, "**", "*.json"), recursive=True)
+    assert os.path.commonpath([isolated_cache, path]) == str(isolated_cache)
+
+
+
+def test_memory_layer_keeps_only_recently_used_entries(monkeypatch):
+    monkeypatch.setattr(cache, "MEMORY_CACHE_SIZE", 2)
+
+    @cache.cached()
+    def get_market_cap(ticker):
+        return 100.0
+
+    get_market_cap("AAPL")
+    get_market_cap("MSFT")
+    get_market_cap("AAPL")
+    get_market_cap("NVDA")
+
+    assert len(cache.memory_cache) == 2
+    assert [key.split(os.sep)[0] for key in cache.memory_cache] == ["AAPL", "NVDA"]